@@ -0,0 +1,37 @@
+# Gunicorn configuration for the KhietAn Homestay backend
+# Usage (from the backend folder): gunicorn server:app
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Threaded workers: PyMongo releases the GIL while waiting on the socket,
+# so each worker can keep several MongoDB requests in flight at once.
+# Set GUNICORN_WORKER_CLASS=gevent for cooperative workers instead; gunicorn
+# monkey-patches the standard library before loading the app (which is why
+# those workers do not preload it, see below).
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+# One process per core (plus spare) sidesteps the GIL for CPU-bound work
+workers = int(os.getenv('GUNICORN_WORKERS', 2 * (os.cpu_count() or 1) + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+timeout = 30
+# Probes, cron jobs and the admin UI call repeatedly from a few clients;
+# keep their connections open between requests
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 30))
+
+# Import the app once in the master; workers share its loaded data
+# copy-on-write. The master skips MongoDB entirely: no client, monitor
+# threads or backup sync outlive the fork, and each worker connects in
+# post_fork. Monkey-patching workers must import the app themselves, after
+# patching, so they do not preload.
+preload_app = not worker_class.startswith(('gevent', 'eventlet'))
+if preload_app:
+    os.environ['MONGODB_CONNECT_AFTER_FORK'] = '1'
+
+def post_fork(server, worker):
+    if preload_app:
+        import server as app_module
+        app_module.connect_mongodb_after_fork()
+
@@ -1,24 +1,47 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, send_from_directory, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
-from pymongo import ReplaceOne
+from pymongo.write_concern import WriteConcern
+from pymongo import ReturnDocument, IndexModel, UpdateOne, timeout as mongo_timeout
+from pymongo.errors import AutoReconnect, PyMongoError
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from bson.codec_options import TypeDecoder, TypeRegistry
 from dotenv import load_dotenv
 import os
-import json
-from datetime import datetime
+import orjson
+import time
+import queue
+import threading
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from functools import lru_cache
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, date, timezone
 import cloudinary
 import cloudinary.api
 
-# Custom JSON encoder to handle datetime and ObjectId
-class MongoJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, ObjectId):
-            return str(obj)
-        return super().default(obj)
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory file locks, backups are only serialized per process
+    fcntl = None
+
+# orjson serializes datetime natively; only ObjectId needs a hook
+def json_default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def dump_json(data, pretty=False):
+    """Serialize data (including MongoDB types) to JSON bytes"""
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    return orjson.dumps(data, default=json_default, option=option)
 
 # Load environment variables
 load_dotenv()
@@ -91,11 +114,43 @@ def get_cloudinary_room_images(room_id):
     
     return result
 
+# Worker pool for fetching images of several rooms concurrently
+cloudinary_executor = ThreadPoolExecutor(max_workers=8)
+
+def has_stored_images(room):
+    """Check whether a room document carries its own image URLs"""
+    db_images = room.get('images', {})
+    return any(db_images.get(key) for key in ('cover', 'room', 'bedroom', 'bathroom', 'exterior'))
+
+def prefetch_cloudinary_images(rooms):
+    """Warm the Cloudinary cache for a list of rooms in parallel.
+    
+    Without this, converting a room list calls the Cloudinary API room by
+    room; running the uncached lookups concurrently bounds the latency by
+    the slowest room instead of the sum of all of them.
+    """
+    room_ids = [
+        str(room.get('_id', '')) for room in rooms
+        if not has_stored_images(room) and str(room.get('_id', '')) not in cloudinary_images_cache
+    ]
+    if len(room_ids) > 1:
+        list(cloudinary_executor.map(get_cloudinary_room_images, room_ids))
+
 # Get the frontend directory path (relative to backend folder)
 FRONTEND_DIR = os.path.join(os.path.dirname(__file__), '..', 'frontend')
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (jsonify, request.get_json)"""
+
+    def dumps(self, obj, **kwargs):
+        return dump_json(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app with static folder pointing to frontend
 app = Flask(__name__, static_folder=FRONTEND_DIR, static_url_path='')
+app.json = OrjsonProvider(app)
 
 # Configure CORS for global access
 CORS(app, resources={
@@ -109,55 +164,278 @@ CORS(app, resources={
 
 # Initialize variables
 client = None
+client_uri = None
 db = None
 rooms_collection = None
+rooms_read_collection = None  # rooms_collection tuned for API reads
+booking_write_collection = None  # rooms_collection acknowledging without journal wait
 fallback_rooms = []
+fallback_index = {}  # _id -> room, for O(1) lookups in fallback mode
+fallback_loaded = False  # fallback_rooms holds the JSON backup's contents
+fallback_file_key = None  # backup_file_key() of the file fallback_rooms matches
+fallback_max_numeric_id = 0
+fallback_health_body = None  # encoded fallback health result, see refresh_fallback_health_body()
 data_source = 'none'
 
 # MongoDB Connection - Try Primary Source First
 
 json_file_path = os.path.join(os.path.dirname(__file__), 'rooms_data.json')
 
+def interval_check_in(interval):
+    """Sort key for booked intervals"""
+    return interval.get('checkIn', '')
+
+def bisect_check_in(intervals, check_in):
+    """bisect_right over intervals sorted by checkIn.
+    
+    Written out because bisect only accepts key= from Python 3.10 on.
+    """
+    low, high = 0, len(intervals)
+    while low < high:
+        middle = (low + high) // 2
+        if check_in < interval_check_in(intervals[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+def backup_file_key(path):
+    """Identify one version of the backup file.
+    
+    Every write renames a new file into place, so the inode changes even
+    when two writes land within the same mtime tick.
+    """
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=1)
+def parse_fallback_file(path, file_key):
+    """Parse the JSON backup; cached until the file is replaced"""
+    return orjson.loads(Path(path).read_bytes())
+
+def read_fallback_rooms():
+    """Read the JSON backup into fallback_rooms (raises if unreadable)"""
+    global fallback_rooms, fallback_loaded, fallback_file_key
+    file_key = backup_file_key(json_file_path)
+    fallback_rooms = parse_fallback_file(json_file_path, file_key)
+    fallback_loaded = True
+    fallback_file_key = file_key
+    # Booking overlap checks rely on intervals sorted by checkIn
+    for room in fallback_rooms:
+        room.get('bookedIntervals', []).sort(key=interval_check_in)
+    rebuild_fallback_index()
+
 def load_fallback_data():
     """Load rooms data from JSON file as fallback"""
-    global fallback_rooms, data_source
+    global data_source
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            fallback_rooms = json.load(file)
+        read_fallback_rooms()
         data_source = 'fallback_json'
         return True
     except Exception as e:
         return False
 
+def rebuild_fallback_index():
+    """Index fallback rooms by _id and track the highest numeric room ID"""
+    global fallback_index, fallback_max_numeric_id
+    fallback_index = {room.get('_id'): room for room in fallback_rooms}
+    numeric_ids = [int(room_id) for room_id in fallback_index if str(room_id).isdigit()]
+    fallback_max_numeric_id = max(numeric_ids + [0])
+    refresh_fallback_health_body()
+
+def refresh_fallback_health_body():
+    """Re-encode the fallback health result after fallback_rooms changes"""
+    global fallback_health_body
+    fallback_health_body = dump_json({
+        'status': 'healthy',
+        'database': 'disconnected',
+        'source': 'fallback_json',
+        'rooms_loaded': len(fallback_rooms)
+    })
+
+refresh_fallback_health_body()
+
+# Backups are written by the background sync thread, /backend/sync and
+# fallback-mode writes, in every gunicorn worker. backup_write_lock orders
+# the threads of one process and a flock on backup_lock_path orders the
+# processes, so only one full backup is written at a time.
+backup_write_lock = threading.Lock()
+backup_lock_path = json_file_path + '.lock'
+
+# mkstemp creates files as 0600; backups get the usual umask-based mode
+process_umask = os.umask(0)
+os.umask(process_umask)
+BACKUP_FILE_MODE = 0o666 & ~process_umask
+
+def write_backup_file(path, body):
+    """Replace the file at path with body atomically (temp file + rename)"""
+    # A temp file of its own per write, so concurrent writers (other
+    # threads or gunicorn workers) never write into each other's file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, BACKUP_FILE_MODE)
+        with os.fdopen(fd, 'wb') as file:
+            file.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+@contextmanager
+def backup_file_lock():
+    """Hold the backup file against other threads and worker processes"""
+    with backup_write_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(backup_lock_path, 'wb') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+def write_json_backup(rooms):
+    """Write rooms to the JSON backup, one writer at a time"""
+    # Encode before taking the locks; they only cover the file write
+    body = dump_json(rooms, pretty=True)
+    with backup_file_lock():
+        write_backup_file(json_file_path, body)
+
+def reload_changed_fallback_rooms():
+    """Re-read the backup if another worker replaced it since it was read.
+    
+    The caller holds backup_write_lock, so no thread of this process is
+    in the middle of changing fallback_rooms.
+    """
+    try:
+        file_key = backup_file_key(json_file_path)
+    except FileNotFoundError:
+        return
+    if file_key != fallback_file_key:
+        read_fallback_rooms()
+        invalidate_rooms_cache()
+
+@contextmanager
+def fallback_transaction():
+    """Read-modify-write the JSON backup in fallback mode.
+    
+    Every gunicorn worker holds its own copy of fallback_rooms. A write
+    takes the backup lock, catches up with changes other workers saved,
+    and (through save_fallback_data) writes the result before releasing
+    the lock, so concurrent writes in different workers are merged
+    rather than overwriting each other.
+    """
+    with backup_file_lock():
+        reload_changed_fallback_rooms()
+        yield
+
 def sync_mongodb_to_json():
     """Sync MongoDB data to local JSON file for backup"""
     global rooms_collection
     try:
         if rooms_collection is not None:
-            rooms_from_db = list(rooms_collection.find())
-            with open(json_file_path, 'w', encoding='utf-8') as file:
-                json.dump(rooms_from_db, file, indent=4, ensure_ascii=False, cls=MongoJSONEncoder)
+            rooms_from_db = list(rooms_collection.find({}, batch_size=500))
+            write_json_backup(rooms_from_db)
             return True
     except Exception as sync_error:
         pass
     return False
 
+# Background JSON backup: mutations only signal the worker thread, which
+# coalesces a burst of writes into a single full-collection dump
+SYNC_DEBOUNCE_SECONDS = 0.5
+SYNC_MIN_INTERVAL_SECONDS = float(os.getenv('SYNC_MIN_INTERVAL_SECONDS', '5'))
+sync_queue = queue.Queue(maxsize=1)
+sync_thread = None
+sync_thread_lock = threading.Lock()
+
+def json_sync_worker():
+    """Wait for sync requests and dump MongoDB to JSON once per burst"""
+    last_sync = -SYNC_MIN_INTERVAL_SECONDS
+    while True:
+        sync_queue.get()
+        # Let the burst settle, and never dump more often than the minimum interval
+        time.sleep(max(SYNC_DEBOUNCE_SECONDS, last_sync + SYNC_MIN_INTERVAL_SECONDS - time.monotonic()))
+        sync_mongodb_to_json()
+        last_sync = time.monotonic()
+
+def schedule_json_sync():
+    """Request a MongoDB to JSON backup without blocking the current request"""
+    global sync_thread
+    with sync_thread_lock:
+        # Started lazily so every (forked) worker process gets its own thread
+        if sync_thread is None or not sync_thread.is_alive():
+            sync_thread = threading.Thread(target=json_sync_worker, daemon=True)
+            sync_thread.start()
+    try:
+        sync_queue.put_nowait(1)
+    except queue.Full:
+        # A sync is already pending and will pick up this change too
+        pass
+
+# Indexes the queries rely on, created in one command at startup
+ROOM_INDEXES = [
+    # Availability and booking lookups filter on interval dates
+    IndexModel([('bookedIntervals.checkIn', 1), ('bookedIntervals.checkOut', 1)])
+]
+
+def ensure_indexes():
+    """Create the room indexes if missing (no-op when they already exist)"""
+    try:
+        rooms_collection.create_indexes(ROOM_INDEXES)
+        return True
+    except Exception as index_error:
+        # Missing privileges must not prevent using the database
+        return False
+
+class ObjectIdToStrDecoder(TypeDecoder):
+    """Decode ObjectId values straight to str for API reads"""
+    bson_type = ObjectId
+
+    def transform_bson(self, value):
+        return str(value)
+
+# Fields used to build API responses; anything else stays in MongoDB
+ROOM_API_PROJECTION = {
+    'name': 1,
+    'price': 1,
+    'persons': 1,
+    'description': 1,
+    'amenities': 1,
+    'bookedIntervals': 1,
+    'images': 1,
+    'promotion': 1,
+    'created_at': 1,
+    'updated_at': 1,
+    'api_view': 1
+}
+
 def connect_mongodb():
-    """Attempt to connect to MongoDB"""
-    global client, db, rooms_collection, data_source
+    """Attempt to connect to MongoDB, reusing the existing client if possible"""
+    global client, client_uri, db, rooms_collection, rooms_read_collection, booking_write_collection, data_source
     
     uri = os.getenv('MONGODB_URI')
     if not uri:
         return False
     
     try:
-        client = MongoClient(
-            uri, 
-            server_api=ServerApi('1'),
-            tls=True,
-            tlsAllowInvalidCertificates=True,
-            serverSelectionTimeoutMS=5000
-        )
+        # MongoClient is a thread-safe pool: keep a single one per process
+        # and only replace it when the connection string changes
+        if client is None or uri != client_uri:
+            old_client = client
+            client = MongoClient(
+                uri, 
+                server_api=ServerApi('1'),
+                tls=True,
+                tlsAllowInvalidCertificates=True,
+                serverSelectionTimeoutMS=5000,
+                # Enough sockets for every concurrent request of a worker
+                maxPoolSize=int(os.getenv('MONGODB_MAX_POOL_SIZE', '100')),
+                minPoolSize=int(os.getenv('MONGODB_MIN_POOL_SIZE', '0'))
+            )
+            client_uri = uri
+            if old_client is not None:
+                old_client.close()
+        
         # Verify connection
         client.admin.command('ping')
         
@@ -166,34 +444,189 @@ def connect_mongodb():
         
         db = client[db_name]
         rooms_collection = db[collection_name]
+        # Read-only handle: ObjectIds arrive as str, ready for JSON
+        rooms_read_collection = rooms_collection.with_options(
+            codec_options=rooms_collection.codec_options.with_options(
+                type_registry=TypeRegistry([ObjectIdToStrDecoder()])
+            )
+        )
+        # Booking detail edits don't ask for an explicit journal wait. 'w' is
+        # left unset so the server's default (w:"majority" on MongoDB 5.0+ /
+        # Atlas) still protects acknowledged edits from failover rollbacks.
+        booking_write_collection = rooms_collection.with_options(
+            write_concern=WriteConcern(j=False)
+        )
         data_source = 'mongodb'
         
-        # Sync to JSON as backup
-        sync_mongodb_to_json()
+        ensure_indexes()
+        
+        # Sync to JSON as backup, off the startup / reconnect path
+        schedule_json_sync()
         return True
         
     except Exception as e:
+        # Release the sockets of a client we are not going to use
+        if client is not None:
+            client.close()
         client = None
+        client_uri = None
         db = None
         rooms_collection = None
+        rooms_read_collection = None
+        booking_write_collection = None
         return False
 
+# Circuit breaker: after repeated connection errors, reads are served from
+# the JSON backup without waiting on MongoDB until a background ping succeeds
+MONGO_FAILURE_THRESHOLD = 3
+MONGO_OPEN_SECONDS = 30
+MONGO_PROBE_INTERVAL = 10
+mongo_failures = 0
+mongo_last_failure = 0
+mongo_open_until = 0
+mongo_probe_thread = None
+mongo_breaker_lock = threading.Lock()
+
+def mongo_circuit_open():
+    """Check whether MongoDB is currently being bypassed"""
+    return time.monotonic() < mongo_open_until
+
+def use_fallback_data():
+    """Check whether reads should be served from fallback_rooms"""
+    return rooms_collection is None or mongo_circuit_open()
+
+def fallback_data_missing():
+    """Check whether MongoDB is bypassed without a backup to read instead"""
+    return rooms_collection is not None and mongo_circuit_open() and not fallback_loaded
+
+def record_mongo_failure(error):
+    """Count MongoDB connection errors and open the circuit when they pile up"""
+    global mongo_failures, mongo_last_failure, mongo_open_until, mongo_probe_thread, fallback_loaded
+    if not isinstance(error, AutoReconnect):
+        return
+    
+    with mongo_breaker_lock:
+        now = time.monotonic()
+        if now - mongo_last_failure > MONGO_OPEN_SECONDS:
+            mongo_failures = 0
+        mongo_failures += 1
+        mongo_last_failure = now
+        if mongo_failures <= MONGO_FAILURE_THRESHOLD or mongo_circuit_open():
+            return
+        
+        mongo_open_until = now + MONGO_OPEN_SECONDS
+        try:
+            # Serve the latest backup while MongoDB is unreachable
+            read_fallback_rooms()
+        except Exception as load_error:
+            # No usable backup (missing, unreadable): reads answer 503
+            # rather than an empty room list
+            fallback_loaded = False
+        if mongo_probe_thread is None or not mongo_probe_thread.is_alive():
+            mongo_probe_thread = threading.Thread(target=mongo_probe_worker, daemon=True)
+            mongo_probe_thread.start()
+    invalidate_rooms_cache()
+
+def mongo_probe_worker():
+    """Ping MongoDB in the background until it answers, then close the circuit"""
+    global mongo_failures, mongo_open_until
+    while client is not None:
+        time.sleep(MONGO_PROBE_INTERVAL)
+        try:
+            client.admin.command('ping')
+        except Exception as ping_error:
+            with mongo_breaker_lock:
+                mongo_open_until = time.monotonic() + MONGO_OPEN_SECONDS
+            continue
+        
+        with mongo_breaker_lock:
+            mongo_failures = 0
+            mongo_open_until = 0
+        invalidate_rooms_cache()
+        return
+
+def database_unavailable_response():
+    """Response for requests MongoDB is needed for while the circuit is open"""
+    return json_response({
+        'success': False,
+        'error': 'Database temporarily unavailable, please try again shortly'
+    }, 503)
+
 # Try to connect to MongoDB, fall back to JSON if failed
-if not connect_mongodb():
+if os.getenv('MONGODB_CONNECT_AFTER_FORK') == '1':
+    # gunicorn master with preload_app: it never serves requests, and
+    # MongoClient is not fork-safe, so only the workers connect (see
+    # connect_mongodb_after_fork). The backup is loaded once and shared.
     load_fallback_data()
+elif not connect_mongodb():
+    load_fallback_data()
+
+def connect_mongodb_after_fork():
+    """Connect a gunicorn worker forked from a preloading master"""
+    if not connect_mongodb():
+        load_fallback_data()
 
 # ===== Helper Functions =====
+@lru_cache(maxsize=1024)
+def parse_object_id(room_id):
+    """Parse room_id as an ObjectId, or return None if it is not one"""
+    try:
+        return ObjectId(room_id)
+    except (InvalidId, TypeError):
+        return None
+
+def build_room_filter(room_id):
+    """Build a query matching a room by its custom string ID or ObjectId"""
+    obj_id = parse_object_id(room_id)
+    if obj_id is None:
+        return {'_id': room_id}
+    return {'$or': [{'_id': room_id}, {'_id': obj_id}]}
+
+def build_room_api_view(room):
+    """Build the API fields that only change when the room itself is edited.
+    
+    Stored on the document as 'api_view' at write time, so reads can use it
+    as-is. Bookings, images and promotion change independently and are
+    added by convert_room_for_api on every read.
+    """
+    # Convert _id to string for JSON serialization
+    id_str = str(room.get('_id', ''))
+    
+    return {
+        'room_id': id_str,
+        'id': id_str,
+        'name': room.get('name', ''),
+        'price': room.get('price', 0),
+        'capacity': room.get('persons', 0),
+        'persons': room.get('persons', 0),
+        'description': room.get('description', ''),
+        'amenities': room.get('amenities', []),
+        # Timestamps stay native; orjson writes datetimes as ISO 8601
+        'created_at': room.get('created_at') or None
+    }
+
+# build_room_api_view as an aggregation expression, so MongoDB can refresh
+# 'api_view' in the same atomic update that changes the room's fields
+ROOM_API_VIEW_EXPRESSION = {
+    'room_id': {'$toString': '$_id'},
+    'id': {'$toString': '$_id'},
+    'name': {'$ifNull': ['$name', '']},
+    'price': {'$ifNull': ['$price', 0]},
+    'capacity': {'$ifNull': ['$persons', 0]},
+    'persons': {'$ifNull': ['$persons', 0]},
+    'description': {'$ifNull': ['$description', '']},
+    'amenities': {'$ifNull': ['$amenities', []]},
+    'created_at': {'$ifNull': ['$created_at', None]}
+}
+
 def convert_room_for_api(room):
     """Convert MongoDB room document to API response format"""
     if room is None:
         return None
     
-    # Convert _id to string for JSON serialization
-    id_value = room.get('_id', '')
-    if isinstance(id_value, ObjectId):
-        id_str = str(id_value)
-    else:
-        id_str = str(id_value)
+    # Use the view precomputed at write time, rebuild it for older documents
+    api_room = dict(room.get('api_view') or build_room_api_view(room))
+    id_str = api_room['id']
     
     # Get images from database first (preserves order), fallback to Cloudinary API
     db_images = room.get('images', {})
@@ -227,35 +660,151 @@ def convert_room_for_api(room):
             'exterior': cloudinary_images.get('exterior', [])
         }
     
-    # Map MongoDB field names to API field names
-    api_room = {
-        'room_id': id_str,
-        'id': id_str,
-        'name': room.get('name', ''),
-        'price': room.get('price', 0),
-        'capacity': room.get('persons', 0),
-        'persons': room.get('persons', 0),
-        'description': room.get('description', ''),
-        'amenities': room.get('amenities', []),
-        'bookedIntervals': room.get('bookedIntervals', []),
-        'created_at': str(room.get('created_at', '')) if room.get('created_at') else None,
-        'updated_at': str(room.get('updated_at', '')) if room.get('updated_at') else None,
-        'coverImage': cover_image,
-        'galleryImages': gallery_images,
-        'categorizedImages': categorized_images,
-        'promotion': room.get('promotion', None)
-    }
+    api_room['bookedIntervals'] = room.get('bookedIntervals', [])
+    api_room['updated_at'] = room.get('updated_at') or None
+    api_room['coverImage'] = cover_image
+    api_room['galleryImages'] = gallery_images
+    api_room['categorizedImages'] = categorized_images
+    api_room['promotion'] = room.get('promotion', None)
     return api_room
 
+# Cache for serialized room list responses (read-heavy public endpoints)
+ROOMS_CACHE_TTL = float(os.getenv('ROOMS_CACHE_TTL', '10'))
+rooms_response_cache = {}
+rooms_cache_version = 0
+
+def get_cached_rooms_response(key):
+    """Return the cached JSON response for key, or None if missing/expired"""
+    entry = rooms_response_cache.get(key)
+    if entry is None or time.monotonic() >= entry['expires']:
+        return None
+    return json_bytes_response(entry['body'])
+
+def cache_rooms_response(key, payload, version):
+    """Serialize payload once, cache it under key and return the response.
+    
+    The body is only stored if no write happened since version was read,
+    so a slow read can never re-populate the cache with stale data.
+    """
+    body = dump_json(payload)
+    if version == rooms_cache_version:
+        rooms_response_cache[key] = {
+            'body': body,
+            'expires': time.monotonic() + ROOMS_CACHE_TTL
+        }
+    return json_bytes_response(body)
+
+def invalidate_rooms_cache():
+    """Drop cached room responses after any data change"""
+    global rooms_cache_version
+    rooms_cache_version += 1
+    rooms_response_cache.clear()
+
 def save_fallback_data():
-    """Save fallback data to JSON file"""
+    """Save fallback data to JSON file (inside fallback_transaction())"""
+    global fallback_file_key
     try:
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(fallback_rooms, f, indent=4, ensure_ascii=False, cls=MongoJSONEncoder)
+        write_backup_file(json_file_path, dump_json(fallback_rooms, pretty=True))
+        # The file now matches fallback_rooms; no need to read it back
+        fallback_file_key = backup_file_key(json_file_path)
         return True
     except Exception as e:
         return False
 
+@app.before_request
+def reload_backup_saved_by_other_workers():
+    """In fallback mode, serve what other gunicorn workers saved.
+    
+    Each worker has its own fallback_rooms and room list cache; a changed
+    backup file replaces both, so all workers answer from the same data.
+    """
+    if rooms_collection is None:
+        with backup_write_lock:
+            reload_changed_fallback_rooms()
+
+def json_bytes_response(body, status=200):
+    """Wrap an already encoded JSON body in a response"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def json_response(payload, status=200):
+    """Build a JSON response encoded with orjson"""
+    return json_bytes_response(dump_json(payload), status)
+
+# Fixed payloads, encoded once at import. Each request still gets its own
+# Response object, since after_request hooks (CORS) modify its headers.
+NOT_FOUND_BODY = dump_json({'success': False, 'error': 'Endpoint not found'})
+INTERNAL_ERROR_BODY = dump_json({'success': False, 'error': 'Internal server error'})
+BOOKING_UPDATED_BODY = dump_json({'success': True, 'message': 'Booking updated successfully'})
+BOOKING_UNCHANGED_BODY = dump_json({'success': True, 'message': 'Booking already up to date'})
+
+# Outcomes of the maintenance endpoints, as (body, status) by name
+STATUS_RESPONSES = {
+    'reconnect_ok': (dump_json({
+        'success': True,
+        'message': 'Successfully reconnected to MongoDB',
+        'source': 'mongodb'
+    }), 200),
+    'sync_ok': (dump_json({
+        'success': True,
+        'message': 'Data synced to JSON backup'
+    }), 200),
+    'sync_failed': (dump_json({
+        'success': False,
+        'message': 'Failed to sync data'
+    }), 500),
+    'sync_no_mongodb': (dump_json({
+        'success': False,
+        'message': 'MongoDB not connected, nothing to sync'
+    }), 400)
+}
+
+def status_response(name):
+    """Response for one of the prebuilt STATUS_RESPONSES"""
+    body, status = STATUS_RESPONSES[name]
+    return json_bytes_response(body, status)
+
+@lru_cache(maxsize=4)
+def reconnect_failed_body(source):
+    """Encoded reconnect failure, built once per data source"""
+    return dump_json({
+        'success': False,
+        'message': 'Failed to reconnect to MongoDB, using fallback data',
+        'source': source
+    })
+
+STREAM_BATCH_SIZE = 100
+
+def stream_rooms_response(cursor, source):
+    """Stream a room list as JSON while it is read from the cursor.
+    
+    Only one batch of rooms is held in memory at a time. The first batch is
+    fetched before the response starts, so connection errors still surface
+    as a regular error response. A later failure can only end the stream:
+    the 200 status is already sent and the client gets truncated JSON.
+    """
+    batch = list(islice(cursor, STREAM_BATCH_SIZE))
+    
+    def generate():
+        current = batch
+        count = 0
+        yield b'{"success":true,"data":['
+        try:
+            while current:
+                prefetch_cloudinary_images(current)
+                for room in current:
+                    yield (b',' if count else b'') + dump_json(convert_room_for_api(room))
+                    count += 1
+                current = list(islice(cursor, STREAM_BATCH_SIZE))
+        except Exception as e:
+            # Count it like any other failed read, then abort the response
+            record_mongo_failure(e)
+            cursor.close()
+            raise
+        # Close the array and append the remaining top-level fields
+        yield b'],' + dump_json({'count': count, 'source': source})[1:]
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
 # ===== Root & Info Endpoints =====
 
 @app.route('/', methods=['GET'])
@@ -263,21 +812,26 @@ def root():
     """Serve the frontend homepage"""
     return send_from_directory(FRONTEND_DIR, 'index.html')
 
-@app.route('/api-info', methods=['GET'])
-def api_info():
-    """API info endpoint"""
-    return jsonify({
+@lru_cache(maxsize=4)
+def api_info_body(source):
+    """Encoded API info, built once per data source"""
+    return dump_json({
         'success': True,
         'message': 'KhietAn Homestay API is running',
         'version': '1.0.0',
-        'data_source': data_source,
+        'data_source': source,
         'endpoints': {
             'health': '/backend/health',
             'rooms': '/backend/api/rooms',
             'admin_rooms': '/backend/api/admin/rooms',
             'clear_image_cache': '/backend/api/admin/clear-image-cache'
         }
-    }), 200
+    })
+
+@app.route('/api-info', methods=['GET'])
+def api_info():
+    """API info endpoint"""
+    return json_bytes_response(api_info_body(data_source))
 
 @app.route('/backend/api/admin/clear-image-cache', methods=['POST'])
 def clear_image_cache():
@@ -289,17 +843,19 @@ def clear_image_cache():
         # Clear cache for specific room
         if room_id in cloudinary_images_cache:
             del cloudinary_images_cache[room_id]
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': f'Image cache cleared for room {room_id}'
-        }), 200
+        })
     else:
         # Clear entire cache
         cloudinary_images_cache = {}
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': 'All image cache cleared'
-        }), 200
+        })
 
 # ===== Serve Frontend Static Files =====
 
@@ -335,39 +891,53 @@ def serve_assets(filename):
 def get_public_rooms():
     """Fetch all rooms for public display"""
     try:
-        if rooms_collection is None:
+        cached = get_cached_rooms_response('public')
+        if cached is not None:
+            return cached
+        version = rooms_cache_version
+        
+        if fallback_data_missing():
+            return database_unavailable_response()
+        if use_fallback_data():
             # Use fallback JSON data
+            prefetch_cloudinary_images(fallback_rooms)
             api_rooms = [convert_room_for_api(room) for room in fallback_rooms]
-            return jsonify({
+            payload = {
                 'success': True,
                 'data': api_rooms,
                 'count': len(api_rooms),
                 'source': 'fallback'
-            }), 200
+            }
+            if not api_rooms:
+                # Never keep an empty fallback list around
+                return json_response(payload)
+            return cache_rooms_response('public', payload, version)
         
-        rooms = list(rooms_collection.find())
+        rooms = list(rooms_read_collection.find({}, ROOM_API_PROJECTION))
+        prefetch_cloudinary_images(rooms)
         api_rooms = [convert_room_for_api(room) for room in rooms]
         
-        return jsonify({
+        return cache_rooms_response('public', {
             'success': True,
             'data': api_rooms,
             'count': len(api_rooms),
             'source': 'mongodb'
-        }), 200
+        }, version)
     except Exception as e:
+        record_mongo_failure(e)
         # If MongoDB fails during request, try fallback
         if fallback_rooms:
             api_rooms = [convert_room_for_api(room) for room in fallback_rooms]
-            return jsonify({
+            return json_response({
                 'success': True,
                 'data': api_rooms,
                 'count': len(api_rooms),
                 'source': 'fallback_error_recovery'
-            }), 200
-        return jsonify({
+            })
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/rooms/<room_id>', methods=['GET'])
 def get_public_room(room_id):
@@ -375,101 +945,128 @@ def get_public_room(room_id):
     try:
         room = None
         
-        if rooms_collection is None:
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
+        if fallback_data_missing():
+            return database_unavailable_response()
+        if use_fallback_data():
+            room = fallback_index.get(room_id)
         else:
-            room = rooms_collection.find_one({'_id': room_id})
-            if not room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    room = rooms_collection.find_one({'_id': obj_id})
-                except:
-                    pass
+            room = rooms_read_collection.find_one(build_room_filter(room_id), ROOM_API_PROJECTION)
         
         if not room:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Room not found'
-            }), 404
+            }, 404)
         
         api_room = convert_room_for_api(room)
-        return jsonify({
+        return json_response({
             'success': True,
             'data': api_room
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/rooms/available', methods=['GET'])
 def get_available_rooms():
     """Fetch only available rooms"""
     try:
-        today = datetime.now().strftime('%Y-%m-%d')
+        today = date.today().isoformat()
+        cache_key = ('available', today)
+        cached = get_cached_rooms_response(cache_key)
+        if cached is not None:
+            return cached
+        version = rooms_cache_version
         available_rooms = []
         
-        if rooms_collection is None:
-            rooms = fallback_rooms
+        if fallback_data_missing():
+            return database_unavailable_response()
+        if use_fallback_data():
+            rooms = []
+            for room in fallback_rooms:
+                is_available = True
+                for interval in room.get('bookedIntervals', []):
+                    check_in = interval.get('checkIn', '')
+                    check_out = interval.get('checkOut', '')
+                    if check_in <= today < check_out:
+                        is_available = False
+                        break
+                if is_available:
+                    rooms.append(room)
         else:
-            rooms = list(rooms_collection.find())
+            # Let MongoDB drop rooms with a booking covering today
+            rooms = list(rooms_read_collection.find({
+                'bookedIntervals': {
+                    '$not': {
+                        '$elemMatch': {
+                            'checkIn': {'$lte': today},
+                            'checkOut': {'$gt': today}
+                        }
+                    }
+                }
+            }, ROOM_API_PROJECTION))
         
+        prefetch_cloudinary_images(rooms)
         for room in rooms:
-            is_available = True
-            booked_intervals = room.get('bookedIntervals', [])
-            
-            for interval in booked_intervals:
-                check_in = interval.get('checkIn', '')
-                check_out = interval.get('checkOut', '')
-                if check_in <= today < check_out:
-                    is_available = False
-                    break
-            
-            if is_available:
-                api_room = convert_room_for_api(room)
-                api_room['available'] = True
-                available_rooms.append(api_room)
+            api_room = convert_room_for_api(room)
+            api_room['available'] = True
+            available_rooms.append(api_room)
         
-        return jsonify({
+        return cache_rooms_response(cache_key, {
             'success': True,
             'data': available_rooms,
             'count': len(available_rooms)
-        }), 200
+        }, version)
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/rooms/<room_id>/status', methods=['GET'])
 def get_room_status(room_id):
     """Get availability status for a specific room"""
     try:
-        room = None
+        today = date.today().isoformat()
         
-        if rooms_collection is None:
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
+        if fallback_data_missing():
+            return database_unavailable_response()
+        if use_fallback_data():
+            room = fallback_index.get(room_id)
+            # Intervals are sorted and disjoint: only the last one starting
+            # on or before today can cover it
+            intervals = room.get('bookedIntervals', []) if room else []
+            index = bisect_check_in(intervals, today)
+            candidates = intervals[max(index - 1, 0):index]
         else:
-            room = rooms_collection.find_one({'_id': room_id})
-            if not room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    room = rooms_collection.find_one({'_id': obj_id})
-                except:
-                    pass
+            # Let MongoDB return only the interval covering today, if any
+            room = rooms_read_collection.find_one(
+                build_room_filter(room_id),
+                {
+                    'bookedIntervals': {
+                        '$elemMatch': {
+                            'checkIn': {'$lte': today},
+                            'checkOut': {'$gt': today}
+                        }
+                    }
+                }
+            )
+            candidates = room.get('bookedIntervals', []) if room else []
         
         if not room:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Room not found'
-            }), 404
+            }, 404)
         
-        today = datetime.now().strftime('%Y-%m-%d')
         is_available = True
         current_booking = None
         
-        for interval in room.get('bookedIntervals', []):
+        for interval in candidates:
             check_in = interval.get('checkIn', '')
             check_out = interval.get('checkOut', '')
             if check_in <= today < check_out:
@@ -480,7 +1077,7 @@ def get_room_status(room_id):
                 }
                 break
         
-        return jsonify({
+        return json_response({
             'success': True,
             'data': {
                 'room_id': room_id,
@@ -488,12 +1085,13 @@ def get_room_status(room_id):
                 'status': 'available' if is_available else 'booked',
                 'currentBooking': current_booking
             }
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 # ===== Admin Room API Endpoints =====
 
@@ -501,29 +1099,26 @@ def get_room_status(room_id):
 def get_all_rooms():
     """Fetch all rooms from MongoDB or fallback JSON"""
     try:
-        if rooms_collection is None:
+        if fallback_data_missing():
+            return database_unavailable_response()
+        if use_fallback_data():
+            prefetch_cloudinary_images(fallback_rooms)
             api_rooms = [convert_room_for_api(room) for room in fallback_rooms]
-            return jsonify({
+            return json_response({
                 'success': True,
                 'data': api_rooms,
                 'count': len(api_rooms),
                 'source': 'fallback'
-            }), 200
-        
-        rooms = list(rooms_collection.find())
-        api_rooms = [convert_room_for_api(room) for room in rooms]
+            })
         
-        return jsonify({
-            'success': True,
-            'data': api_rooms,
-            'count': len(api_rooms),
-            'source': 'mongodb'
-        }), 200
+        cursor = rooms_read_collection.find({}, ROOM_API_PROJECTION, batch_size=STREAM_BATCH_SIZE)
+        return stream_rooms_response(cursor, 'mongodb')
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/admin/rooms/<room_id>', methods=['GET'])
 def get_room(room_id):
@@ -531,58 +1126,59 @@ def get_room(room_id):
     try:
         room = None
         
-        if rooms_collection is None:
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
+        if fallback_data_missing():
+            return database_unavailable_response()
+        if use_fallback_data():
+            room = fallback_index.get(room_id)
         else:
-            room = rooms_collection.find_one({'_id': room_id})
-            if not room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    room = rooms_collection.find_one({'_id': obj_id})
-                except:
-                    pass
+            room = rooms_read_collection.find_one(build_room_filter(room_id), ROOM_API_PROJECTION)
         
         if not room:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Room not found'
-            }), 404
+            }, 404)
         
         api_room = convert_room_for_api(room)
-        return jsonify({
+        return json_response({
             'success': True,
             'data': api_room
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/admin/rooms', methods=['POST'])
 def add_room():
     """Add a new room to MongoDB using upsert with custom ID"""
     try:
+        if mongo_circuit_open():
+            return database_unavailable_response()
+        
         data = request.get_json()
         
         # Validate required fields
         required_fields = ['name', 'price', 'capacity', 'description', 'amenities']
         if not all(field in data for field in required_fields):
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Missing required fields'
-            }), 400
+            }, 400)
         
         # Get custom ID (4 digit room ID like 0101, 0201)
         custom_id = data.get('custom_id')
         if custom_id:
             if not custom_id.isdigit() or len(custom_id) != 4:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'error': 'Room ID must be exactly 4 digits (e.g., 0101, 0201)'
-                }), 400
+                }, 400)
         
         # Prepare room document
+        now = datetime.now(timezone.utc)
         new_room = {
             'name': data.get('name'),
             'price': float(data.get('price')),
@@ -590,185 +1186,193 @@ def add_room():
             'description': data.get('description'),
             'amenities': data.get('amenities', []),
             'bookedIntervals': [],
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow()
+            'created_at': now,
+            'updated_at': now
         }
         
         if rooms_collection is None:
-            # Add to fallback list
-            if custom_id:
-                new_room['_id'] = custom_id
-            else:
-                numeric_ids = [int(r.get('_id', 0)) for r in fallback_rooms if str(r.get('_id', '0')).isdigit()]
-                new_id = str(max(numeric_ids + [0]) + 1).zfill(4)
-                new_room['_id'] = new_id
+            with fallback_transaction():
+                # Add to fallback list
+                global fallback_max_numeric_id
+                if custom_id:
+                    new_room['_id'] = custom_id
+                else:
+                    new_room['_id'] = str(fallback_max_numeric_id + 1).zfill(4)
             
-            # Check for duplicate
-            existing = next((r for r in fallback_rooms if r.get('_id') == new_room['_id']), None)
-            if existing:
-                return jsonify({
-                    'success': False,
-                    'error': f'Room with ID {new_room["_id"]} already exists'
-                }), 400
+                # Check for duplicate
+                if new_room['_id'] in fallback_index:
+                    return json_response({
+                        'success': False,
+                        'error': f'Room with ID {new_room["_id"]} already exists'
+                    }, 400)
             
-            fallback_rooms.append(new_room)
-            save_fallback_data()
-            api_room = convert_room_for_api(new_room.copy())
+                new_room['api_view'] = build_room_api_view(new_room)
+                fallback_rooms.append(new_room)
+                fallback_index[new_room['_id']] = new_room
+                refresh_fallback_health_body()
+                fallback_max_numeric_id = max(fallback_max_numeric_id, int(new_room['_id']))
+                save_fallback_data()
+                api_room = convert_room_for_api(new_room.copy())
         else:
             # MongoDB mode
             if custom_id:
                 new_room['_id'] = custom_id
                 existing = rooms_collection.find_one({'_id': custom_id})
                 if existing:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'error': f'Room with ID {custom_id} already exists'
-                    }), 400
+                    }, 400)
             else:
                 new_room['_id'] = ObjectId()
             
-            operations = [ReplaceOne({'_id': new_room['_id']}, new_room, upsert=True)]
-            result = rooms_collection.bulk_write(operations)
+            new_room['api_view'] = build_room_api_view(new_room)
+            rooms_collection.replace_one({'_id': new_room['_id']}, new_room, upsert=True)
             
-            # Sync to JSON backup
-            sync_mongodb_to_json()
+            # Sync to JSON backup in the background
+            schedule_json_sync()
             api_room = convert_room_for_api(new_room.copy())
         
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': 'Room added successfully',
             'data': api_room
-        }), 201
+        }, 201)
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/admin/rooms/<room_id>', methods=['PUT'])
 def update_room(room_id):
     """Update a room in MongoDB using upsert"""
     try:
+        if mongo_circuit_open():
+            return database_unavailable_response()
+        
         data = request.get_json()
+        now = datetime.now(timezone.utc)
         
         if rooms_collection is None:
-            # Update in fallback data
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
-            if not room:
-                return jsonify({
-                    'success': False,
-                    'error': 'Room not found'
-                }), 404
+            with fallback_transaction():
+                # Update in fallback data
+                room = fallback_index.get(room_id)
+                if not room:
+                    return json_response({
+                        'success': False,
+                        'error': 'Room not found'
+                    }, 404)
             
-            if 'name' in data:
-                room['name'] = data['name']
-            if 'price' in data:
-                room['price'] = float(data['price'])
-            if 'capacity' in data:
-                room['persons'] = int(data['capacity'])
-            if 'description' in data:
-                room['description'] = data['description']
-            if 'amenities' in data:
-                room['amenities'] = data['amenities']
-            room['updated_at'] = datetime.utcnow().isoformat()
+                if 'name' in data:
+                    room['name'] = data['name']
+                if 'price' in data:
+                    room['price'] = float(data['price'])
+                if 'capacity' in data:
+                    room['persons'] = int(data['capacity'])
+                if 'description' in data:
+                    room['description'] = data['description']
+                if 'amenities' in data:
+                    room['amenities'] = data['amenities']
+                room['updated_at'] = now.isoformat()
+                room['api_view'] = build_room_api_view(room)
             
-            save_fallback_data()
-            api_room = convert_room_for_api(room.copy())
+                save_fallback_data()
+                api_room = convert_room_for_api(room.copy())
         else:
-            # Find existing room
-            existing_room = rooms_collection.find_one({'_id': room_id})
-            if not existing_room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    existing_room = rooms_collection.find_one({'_id': obj_id})
-                    if existing_room:
-                        room_id = obj_id
-                except:
-                    pass
-            
-            if not existing_room:
-                return jsonify({
-                    'success': False,
-                    'error': 'Room not found'
-                }), 404
-            
-            updated_room = existing_room.copy()
-            updated_room['_id'] = room_id
-            
+            # Only send the changed fields, in a single round-trip
+            patch = {}
             if 'name' in data:
-                updated_room['name'] = data['name']
+                patch['name'] = data['name']
             if 'price' in data:
-                updated_room['price'] = float(data['price'])
+                patch['price'] = float(data['price'])
             if 'capacity' in data:
-                updated_room['persons'] = int(data['capacity'])
+                patch['persons'] = int(data['capacity'])
             if 'persons' in data:
-                updated_room['persons'] = int(data['persons'])
+                patch['persons'] = int(data['persons'])
             if 'description' in data:
-                updated_room['description'] = data['description']
+                patch['description'] = data['description']
             if 'amenities' in data:
-                updated_room['amenities'] = data['amenities']
-            updated_room['updated_at'] = datetime.utcnow()
+                patch['amenities'] = data['amenities']
+            patch['updated_at'] = now
+            
+            # Pipeline update: the second stage rebuilds the API view from the
+            # patched fields, so both change together. Values are wrapped in
+            # $literal so strings like '$name' are not read as field paths.
+            updated_room = rooms_collection.find_one_and_update(
+                build_room_filter(room_id),
+                [
+                    {'$set': {field: {'$literal': value} for field, value in patch.items()}},
+                    {'$set': {'api_view': ROOM_API_VIEW_EXPRESSION}}
+                ],
+                return_document=ReturnDocument.AFTER
+            )
             
-            operations = [ReplaceOne({'_id': room_id}, updated_room, upsert=True)]
-            result = rooms_collection.bulk_write(operations)
+            if not updated_room:
+                return json_response({
+                    'success': False,
+                    'error': 'Room not found'
+                }, 404)
             
-            sync_mongodb_to_json()
-            api_room = convert_room_for_api(updated_room.copy())
+            schedule_json_sync()
+            api_room = convert_room_for_api(updated_room)
         
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': 'Room updated successfully',
             'data': api_room
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/admin/rooms/<room_id>', methods=['DELETE'])
 def delete_room(room_id):
     """Delete a room from MongoDB or fallback list"""
     try:
+        if mongo_circuit_open():
+            return database_unavailable_response()
+        
         if rooms_collection is None:
-            global fallback_rooms
-            original_count = len(fallback_rooms)
-            fallback_rooms = [r for r in fallback_rooms if r.get('_id') != room_id]
-            
-            if len(fallback_rooms) == original_count:
-                return jsonify({
-                    'success': False,
-                    'error': 'Room not found'
-                }), 404
+            with fallback_transaction():
+                room = fallback_index.pop(room_id, None)
+                if room is None:
+                    return json_response({
+                        'success': False,
+                        'error': 'Room not found'
+                    }, 404)
             
-            save_fallback_data()
+                fallback_rooms.remove(room)
+                refresh_fallback_health_body()
+                save_fallback_data()
         else:
-            result = rooms_collection.delete_one({'_id': room_id})
+            result = rooms_collection.delete_one(build_room_filter(room_id))
             
             if result.deleted_count == 0:
-                try:
-                    obj_id = ObjectId(room_id)
-                    result = rooms_collection.delete_one({'_id': obj_id})
-                except:
-                    pass
-            
-            if result.deleted_count == 0:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'error': 'Room not found'
-                }), 404
+                }, 404)
             
-            sync_mongodb_to_json()
+            schedule_json_sync()
         
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': 'Room deleted successfully'
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 # ===== Booking API Endpoints =====
 
@@ -776,22 +1380,29 @@ def delete_room(room_id):
 def book_room(room_id):
     """Create a booking for a room"""
     try:
+        if mongo_circuit_open():
+            return database_unavailable_response()
+        
         data = request.json
         
         if not data.get('checkIn') or not data.get('checkOut') or not data.get('guestName'):
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Missing required fields: checkIn, checkOut, guestName'
-            }), 400
+            }, 400)
         
         check_in = data['checkIn']
         check_out = data['checkOut']
         guest_name = data['guestName']
+        now = datetime.now(timezone.utc)
         
         def has_duplicate_booking(existing_intervals):
             if not existing_intervals:
                 return False
-            for interval in existing_intervals:
+            # Intervals are kept sorted by checkIn, so only the last one starting
+            # on or before check_in and the one right after it can clash
+            index = bisect_check_in(existing_intervals, check_in)
+            for interval in existing_intervals[max(index - 1, 0):index + 1]:
                 if (interval.get('checkIn') == check_in and 
                     interval.get('checkOut') == check_out and
                     interval.get('guestName') == guest_name):
@@ -810,132 +1421,135 @@ def book_room(room_id):
             'guestPhone': data.get('guestPhone', ''),
             'guestEmail': data.get('guestEmail', ''),
             'notes': data.get('notes', ''),
-            'createdAt': datetime.now().isoformat()
+            'createdAt': now.isoformat()
         }
         
         if rooms_collection is None:
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
-            if not room:
-                return jsonify({
-                    'success': False,
-                    'error': 'Room not found'
-                }), 404
-            
-            if has_duplicate_booking(room.get('bookedIntervals', [])):
-                return jsonify({
-                    'success': False,
-                    'error': 'Booking already exists or dates overlap with existing booking'
-                }), 409
-            
-            if 'bookedIntervals' not in room:
-                room['bookedIntervals'] = []
-            room['bookedIntervals'].append(new_interval)
-            room['updated_at'] = datetime.now().isoformat()
-            
-            save_fallback_data()
-        else:
-            room = rooms_collection.find_one({'_id': room_id})
-            if not room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    room = rooms_collection.find_one({'_id': obj_id})
-                    room_id_filter = {'_id': obj_id}
-                except:
-                    return jsonify({
+            with fallback_transaction():
+                room = fallback_index.get(room_id)
+                if not room:
+                    return json_response({
                         'success': False,
                         'error': 'Room not found'
-                    }), 404
-            else:
-                room_id_filter = {'_id': room_id}
+                    }, 404)
             
-            if has_duplicate_booking(room.get('bookedIntervals', [])):
-                return jsonify({
-                    'success': False,
-                    'error': 'Booking already exists or dates overlap with existing booking'
-                }), 409
+                if has_duplicate_booking(room.get('bookedIntervals', [])):
+                    return json_response({
+                        'success': False,
+                        'error': 'Booking already exists or dates overlap with existing booking'
+                    }, 409)
+            
+                if 'bookedIntervals' not in room:
+                    room['bookedIntervals'] = []
+                intervals = room['bookedIntervals']
+                intervals.insert(bisect_check_in(intervals, check_in), new_interval)
+                room['updated_at'] = now.isoformat()
             
+                save_fallback_data()
+        else:
+            # Push only if no existing interval is a duplicate or overlaps,
+            # so the check and the write are one atomic operation
+            room_id_filter = build_room_filter(room_id)
             result = rooms_collection.update_one(
-                room_id_filter,
                 {
-                    '$push': {'bookedIntervals': new_interval},
-                    '$set': {'updated_at': datetime.now()}
+                    **room_id_filter,
+                    'bookedIntervals': {
+                        '$not': {
+                            '$elemMatch': {
+                                '$or': [
+                                    {'checkIn': check_in, 'checkOut': check_out, 'guestName': guest_name},
+                                    {'checkIn': {'$lt': check_out}, 'checkOut': {'$gt': check_in}}
+                                ]
+                            }
+                        }
+                    }
+                },
+                {
+                    # Keep intervals sorted by checkIn, like the fallback data
+                    '$push': {'bookedIntervals': {'$each': [new_interval], '$sort': {'checkIn': 1}}},
+                    '$set': {'updated_at': now}
                 }
             )
             
-            if result.modified_count == 0:
-                return jsonify({
+            if result.matched_count == 0:
+                if not rooms_collection.find_one(room_id_filter, {'_id': 1}):
+                    return json_response({
+                        'success': False,
+                        'error': 'Room not found'
+                    }, 404)
+                return json_response({
                     'success': False,
-                    'error': 'Failed to update room'
-                }), 500
+                    'error': 'Booking already exists or dates overlap with existing booking'
+                }, 409)
             
-            sync_mongodb_to_json()
+            schedule_json_sync()
         
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': 'Booking created successfully',
             'data': new_interval
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/backend/api/admin/rooms/<room_id>/unbook', methods=['POST'])
 def unbook_room(room_id):
     """Cancel a booking for a room"""
     try:
+        if mongo_circuit_open():
+            return database_unavailable_response()
+        
         data = request.json
         
         if not data.get('checkIn') or not data.get('checkOut'):
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Missing required fields: checkIn, checkOut'
-            }), 400
+            }, 400)
         
         check_in = data['checkIn']
         check_out = data['checkOut']
+        now = datetime.now(timezone.utc)
         
         if rooms_collection is None:
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
-            if not room:
-                return jsonify({
-                    'success': False,
-                    'error': 'Room not found'
-                }), 404
+            with fallback_transaction():
+                room = fallback_index.get(room_id)
+                if not room:
+                    return json_response({
+                        'success': False,
+                        'error': 'Room not found'
+                    }, 404)
             
-            if 'bookedIntervals' in room:
-                original_length = len(room['bookedIntervals'])
-                room['bookedIntervals'] = [
-                    interval for interval in room['bookedIntervals']
-                    if not (interval['checkIn'] == check_in and interval['checkOut'] == check_out)
-                ]
+                if 'bookedIntervals' in room:
+                    original_length = len(room['bookedIntervals'])
+                    room['bookedIntervals'] = [
+                        interval for interval in room['bookedIntervals']
+                        if not (interval['checkIn'] == check_in and interval['checkOut'] == check_out)
+                    ]
                 
-                if len(room['bookedIntervals']) == original_length:
-                    return jsonify({
-                        'success': False,
-                        'error': 'Booking not found'
-                    }), 404
+                    if len(room['bookedIntervals']) == original_length:
+                        return json_response({
+                            'success': False,
+                            'error': 'Booking not found'
+                        }, 404)
                 
-                room['updated_at'] = datetime.now().isoformat()
-                save_fallback_data()
+                    room['updated_at'] = now.isoformat()
+                    save_fallback_data()
         else:
-            room = rooms_collection.find_one({'_id': room_id})
-            if not room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    room = rooms_collection.find_one({'_id': obj_id})
-                    room_id_filter = {'_id': obj_id}
-                except:
-                    return jsonify({
-                        'success': False,
-                        'error': 'Room not found'
-                    }), 404
-            else:
-                room_id_filter = {'_id': room_id}
-            
+            # Only match rooms that actually hold this booking
+            room_id_filter = build_room_filter(room_id)
             result = rooms_collection.update_one(
-                room_id_filter,
+                {
+                    **room_id_filter,
+                    'bookedIntervals': {
+                        '$elemMatch': {'checkIn': check_in, 'checkOut': check_out}
+                    }
+                },
                 {
                     '$pull': {
                         'bookedIntervals': {
@@ -943,205 +1557,276 @@ def unbook_room(room_id):
                             'checkOut': check_out
                         }
                     },
-                    '$set': {'updated_at': datetime.now()}
+                    '$set': {'updated_at': now}
                 }
             )
             
-            if result.modified_count == 0:
-                return jsonify({
+            if result.matched_count == 0:
+                room_exists = rooms_collection.find_one(room_id_filter, {'_id': 1})
+                return json_response({
                     'success': False,
-                    'error': 'Booking not found or failed to update'
-                }), 404
+                    'error': 'Booking not found' if room_exists else 'Room not found'
+                }, 404)
             
-            sync_mongodb_to_json()
+            schedule_json_sync()
         
-        return jsonify({
+        invalidate_rooms_cache()
+        return json_response({
             'success': True,
             'message': 'Booking cancelled successfully'
-        }), 200
+        })
     except Exception as e:
-        return jsonify({
+        record_mongo_failure(e)
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
+
+# Guest details an update-booking request may change
+BOOKING_DETAIL_FIELDS = ('guestName', 'guestPhone', 'guestEmail', 'notes')
+
+def booking_details(booking):
+    """Guest details of a booking update, with '' for omitted optional fields"""
+    return {field: booking.get(field, '') for field in BOOKING_DETAIL_FIELDS}
 
 @app.route('/backend/api/admin/rooms/<room_id>/update-booking', methods=['PUT'])
 def update_booking(room_id):
     """Update booking information for a room"""
-    try:
-        data = request.json
-        
-        if not data.get('checkIn') or not data.get('checkOut') or not data.get('guestName'):
-            return jsonify({
-                'success': False,
-                'error': 'Missing required fields: checkIn, checkOut, guestName'
-            }), 400
-        
-        check_in = data['checkIn']
-        check_out = data['checkOut']
-        guest_name = data['guestName']
-        guest_phone = data.get('guestPhone', '')
-        guest_email = data.get('guestEmail', '')
-        notes = data.get('notes', '')
-        
-        if rooms_collection is None:
-            room = next((r for r in fallback_rooms if r.get('_id') == room_id), None)
+    if mongo_circuit_open():
+        return database_unavailable_response()
+    
+    data = request.json
+    
+    # Accept a single booking or a list of bookings to update together
+    bookings = data if isinstance(data, list) else [data]
+    
+    if not bookings or not all(
+        isinstance(booking, dict)
+        and booking.get('checkIn') and booking.get('checkOut') and booking.get('guestName')
+        for booking in bookings
+    ):
+        return json_response({
+            'success': False,
+            'error': 'Missing required fields: checkIn, checkOut, guestName'
+        }, 400)
+    
+    now = datetime.now(timezone.utc)
+    details = [booking_details(booking) for booking in bookings]
+    found_count = len(bookings)
+    
+    if rooms_collection is None:
+        with fallback_transaction():
+            room = fallback_index.get(room_id)
             if not room:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'error': 'Room not found'
-                }), 404
-            
-            if 'bookedIntervals' in room:
-                for interval in room['bookedIntervals']:
-                    if interval['checkIn'] == check_in and interval['checkOut'] == check_out:
-                        interval['guestName'] = guest_name
-                        interval['guestPhone'] = guest_phone
-                        interval['guestEmail'] = guest_email
-                        interval['notes'] = notes
-                        interval['updatedAt'] = datetime.now().isoformat()
-                        break
-                else:
-                    return jsonify({
+                }, 404)
+        
+            # Resolve every booking first so a missing one changes nothing
+            intervals = room.get('bookedIntervals', [])
+            matches = []
+            for booking, booking_fields in zip(bookings, details):
+                interval = next((
+                    interval for interval in intervals
+                    if interval['checkIn'] == booking['checkIn'] and interval['checkOut'] == booking['checkOut']
+                ), None)
+                if interval is None:
+                    return json_response({
                         'success': False,
                         'error': 'Booking not found'
-                    }), 404
-                
-                room['updated_at'] = datetime.now().isoformat()
+                    }, 404)
+                # Re-sent details that are already stored are not rewritten
+                if any(interval.get(field) != value for field, value in booking_fields.items()):
+                    matches.append((interval, booking_fields))
+        
+            for interval, booking_fields in matches:
+                interval.update(booking_fields)
+                interval['updatedAt'] = now.isoformat()
+        
+            updated_count = len(matches)
+            if updated_count:
+                room['updated_at'] = now.isoformat()
                 save_fallback_data()
-        else:
-            room = rooms_collection.find_one({'_id': room_id})
-            if not room:
-                try:
-                    obj_id = ObjectId(room_id)
-                    room = rooms_collection.find_one({'_id': obj_id})
-                    room_id_filter = {'_id': obj_id}
-                except:
-                    return jsonify({
-                        'success': False,
-                        'error': 'Room not found'
-                    }), 404
-            else:
-                room_id_filter = {'_id': room_id}
-            
-            result = rooms_collection.update_one(
+    else:
+        room_id_filter = build_room_filter(room_id)
+        
+        def booking_update(booking, booking_fields):
+            return (
                 {
                     **room_id_filter,
-                    'bookedIntervals.checkIn': check_in,
-                    'bookedIntervals.checkOut': check_out
+                    # Both dates must match the same interval, which is
+                    # then the one the positional $ operator updates.
+                    # Intervals already holding these details don't match,
+                    # so a re-sent update is not written at all.
+                    'bookedIntervals': {'$elemMatch': {
+                        'checkIn': booking['checkIn'],
+                        'checkOut': booking['checkOut'],
+                        '$or': [{field: {'$ne': value}} for field, value in booking_fields.items()]
+                    }}
                 },
                 {
                     '$set': {
-                        'bookedIntervals.$.guestName': guest_name,
-                        'bookedIntervals.$.guestPhone': guest_phone,
-                        'bookedIntervals.$.guestEmail': guest_email,
-                        'bookedIntervals.$.notes': notes,
-                        'bookedIntervals.$.updatedAt': datetime.now(),
-                        'updated_at': datetime.now()
+                        **{f'bookedIntervals.$.{field}': value for field, value in booking_fields.items()},
+                        'bookedIntervals.$.updatedAt': now,
+                        'updated_at': now
                     }
                 }
             )
-            
-            if result.matched_count == 0:
-                return jsonify({
+        
+        if len(bookings) == 1:
+            result = booking_write_collection.update_one(*booking_update(bookings[0], details[0]))
+        else:
+            # One round-trip for all bookings; they are independent of each other
+            result = booking_write_collection.bulk_write(
+                [UpdateOne(*booking_update(*pair)) for pair in zip(bookings, details)],
+                ordered=False
+            )
+        updated_count = result.matched_count
+        
+        if updated_count < len(bookings):
+            # Tell unchanged bookings apart from missing ones
+            room = rooms_collection.find_one(
+                room_id_filter,
+                {'bookedIntervals.checkIn': 1, 'bookedIntervals.checkOut': 1}
+            )
+            if room is None:
+                return json_response({
+                    'success': False,
+                    'error': 'Room not found'
+                }, 404)
+            stored = {
+                (interval.get('checkIn'), interval.get('checkOut'))
+                for interval in room.get('bookedIntervals', [])
+            }
+            found_count = sum((booking['checkIn'], booking['checkOut']) in stored for booking in bookings)
+            if found_count == 0:
+                return json_response({
                     'success': False,
                     'error': 'Booking not found'
-                }), 404
-            
-            sync_mongodb_to_json()
+                }, 404)
         
-        return jsonify({
+        if updated_count:
+            schedule_json_sync()
+    
+    if updated_count:
+        invalidate_rooms_cache()
+    if isinstance(data, list):
+        return json_response({
             'success': True,
-            'message': 'Booking updated successfully'
-        }), 200
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+            'message': 'Bookings updated successfully',
+            'updated': updated_count,
+            'unchanged': found_count - updated_count,
+            'not_found': len(bookings) - found_count
+        })
+    return json_bytes_response(BOOKING_UPDATED_BODY if updated_count else BOOKING_UNCHANGED_BODY)
 
 # ===== Health Check & Reconnect =====
 
+# Health probes get a short deadline, and healthy MongoDB answers are reused
+# briefly so a burst of probes costs one ping and one encoding. The fallback
+# answer is encoded whenever fallback_rooms changes.
+HEALTH_PING_TIMEOUT = 0.5
+HEALTH_CACHE_SECONDS = 1
+health_response_cache = {}
+
+def cached_health_body(branch, build_body):
+    """Return the encoded health body for branch, rebuilding it once expired"""
+    entry = health_response_cache.get(branch)
+    if entry is not None and time.monotonic() < entry['expires']:
+        return entry['body']
+    body = build_body()
+    health_response_cache[branch] = {
+        'body': body,
+        'expires': time.monotonic() + HEALTH_CACHE_SECONDS
+    }
+    return body
+
+def mongodb_health_body():
+    """Ping MongoDB within HEALTH_PING_TIMEOUT seconds and encode the result"""
+    with mongo_timeout(HEALTH_PING_TIMEOUT):
+        client.admin.command('ping')
+    return dump_json({
+        'status': 'healthy',
+        'database': 'connected',
+        'source': 'mongodb'
+    })
+
 @app.route('/backend/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    try:
-        if client is not None:
-            client.admin.command('ping')
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected',
-                'source': 'mongodb'
-            }), 200
-        else:
-            return jsonify({
-                'status': 'healthy',
-                'database': 'disconnected',
-                'source': 'fallback_json',
-                'rooms_loaded': len(fallback_rooms)
-            }), 200
-    except Exception as e:
-        return jsonify({
-            'status': 'unhealthy',
-            'error': str(e)
-        }), 500
+    if client is not None:
+        try:
+            response = json_bytes_response(cached_health_body('mongodb', mongodb_health_body))
+        except PyMongoError as e:
+            # Not counted by the circuit breaker: a probe's short deadline
+            # can expire during an election that regular requests outlast
+            response = json_response({
+                'status': 'unhealthy',
+                'error': str(e)
+            }, 500)
+    else:
+        response = json_bytes_response(fallback_health_body)
+    # Probes must reach the app, never a cached copy on the way
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.route('/backend/reconnect', methods=['POST'])
 def reconnect_database():
     """Attempt to reconnect to MongoDB"""
     global client, db, rooms_collection, data_source
     
+    invalidate_rooms_cache()
     if connect_mongodb():
-        return jsonify({
-            'success': True,
-            'message': 'Successfully reconnected to MongoDB',
-            'source': 'mongodb'
-        }), 200
+        return status_response('reconnect_ok')
     else:
-        return jsonify({
-            'success': False,
-            'message': 'Failed to reconnect to MongoDB, using fallback data',
-            'source': data_source
-        }), 200
+        return json_bytes_response(reconnect_failed_body(data_source))
 
 @app.route('/backend/sync', methods=['POST'])
 def sync_data():
     """Manually sync MongoDB data to JSON backup"""
     if rooms_collection is not None:
         if sync_mongodb_to_json():
-            return jsonify({
-                'success': True,
-                'message': 'Data synced to JSON backup'
-            }), 200
+            return status_response('sync_ok')
         else:
-            return jsonify({
-                'success': False,
-                'message': 'Failed to sync data'
-            }), 500
+            return status_response('sync_failed')
     else:
-        return jsonify({
-            'success': False,
-            'message': 'MongoDB not connected, nothing to sync'
-        }), 400
+        return status_response('sync_no_mongodb')
 
 # ===== Error Handlers =====
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        'success': False,
-        'error': 'Endpoint not found'
-    }), 404
+    return json_bytes_response(NOT_FOUND_BODY, 404)
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
+    return json_bytes_response(INTERNAL_ERROR_BODY, 500)
+
+@app.errorhandler(Exception)
+def unhandled_exception(error):
+    # HTTP errors (400, 405, ...) keep their status and headers but use
+    # the API's JSON error envelope instead of Werkzeug's HTML page
+    if isinstance(error, HTTPException):
+        if error.code is None:
+            return error
+        response = json_response({
+            'success': False,
+            'error': error.description
+        }, error.code)
+        for name, value in error.get_headers():
+            if name.lower() != 'content-type':
+                response.headers[name] = value
+        return response
+    record_mongo_failure(error)
+    return json_response({
         'success': False,
-        'error': 'Internal server error'
-    }), 500
+        'error': str(error)
+    }, 500)
 
 # For Vercel deployment - expose the app
 app = app
 
 if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (gunicorn.conf.py)
     app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)